@@ -13,6 +13,6 @@ except Exception:  # local/dev runs
     __version__ = "0+local"
 
 # Convenience imports so `plpred.<module>` works after `import plpred`
-from . import elo, fd_client, ratings, predict, log  # noqa: F401
+from . import elo, fd_client, ratings, predict, log, files  # noqa: F401
 
-__all__ = ["elo", "fd_client", "ratings", "predict", "log", "__version__"]
+__all__ = ["elo", "fd_client", "ratings", "predict", "log", "files", "__version__"]
@@ -0,0 +1,74 @@
+# plpred/_kernels.py
+"""
+Numeric kernels shared by the model modules.
+
+numba is pinned in requirements.txt. Kernels compile lazily on first call and
+are cached on disk. Where numba is not installed, `njit` is a no-op decorator
+and the kernels run as (much slower) plain Python with identical results.
+"""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; kernels then run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
+
+@njit(cache=True, fastmath=True)
+def poisson_pmf(mu, cap):
+    """Poisson PMF for k = 0..cap by running product (no factorials)."""
+    mu = max(mu, 1e-9)
+    pmf = np.empty(cap + 1)
+    pmf[0] = math.exp(-mu)
+    for k in range(1, cap + 1):
+        pmf[k] = pmf[k - 1] * mu / k
+    return pmf
+
+
+@njit(cache=True, fastmath=True)
+def poisson_1x2(mu_h, mu_a, cap, draw_scale):
+    """(P_home, P_draw, P_away) for independent Poisson goals truncated at `cap`."""
+    pmf_h = poisson_pmf(mu_h, cap)
+    pmf_a = poisson_pmf(mu_a, cap)
+
+    # O(cap): P(home win) = sum_i P(h=i) * P(a<i), and symmetrically for away.
+    ph = 0.0
+    pd = 0.0
+    pa = 0.0
+    cdf_h = 0.0  # P(h < i)
+    cdf_a = 0.0  # P(a < i)
+    for i in range(cap + 1):
+        ph += pmf_h[i] * cdf_a
+        pa += pmf_a[i] * cdf_h
+        pd += pmf_h[i] * pmf_a[i]
+        cdf_h += pmf_h[i]
+        cdf_a += pmf_a[i]
+
+    if draw_scale != 1.0:
+        # Reweight draws and renormalise
+        pd *= draw_scale
+        s = ph + pd + pa
+        if s > 0:
+            ph /= s
+            pd /= s
+            pa /= s
+    return ph, pd, pa
+
+
+@njit(cache=True)
+def poisson_1x2_batch(mu_h, mu_a, cap, draw_scale):
+    """`poisson_1x2` over equal-length float64 arrays -> (P_home, P_draw, P_away) arrays."""
+    n = mu_h.shape[0]
+    ph = np.empty(n)
+    pd = np.empty(n)
+    pa = np.empty(n)
+    for i in range(n):
+        ph[i], pd[i], pa[i] = poisson_1x2(mu_h[i], mu_a[i], cap, draw_scale)
+    return ph, pd, pa
@@ -1,38 +1,45 @@
 from __future__ import annotations
 import math
-from datetime import datetime, timezone
 from typing import Dict, Any
+import numpy as np
 import pandas as pd
 
+from ._kernels import njit
+
 DEFAULT_INIT = 1500.0
 DEFAULT_SCALE = 400.0
 DEFAULT_K = 20.0
 DEFAULT_HA_POINTS = 60.0
+_LN10 = math.log(10.0)
+
+# Goal-difference multiplier G(gd) precomputed for the usual small margins;
+# larger margins fall back to the closed form (11 + gd) / 8.
+_G_ARRAY = np.array([1.0 if g <= 1 else 1.5 if g == 2 else (11.0 + g) / 8.0 for g in range(16)])
+
+# Compiled lazily on the first build_elo call (then reused from the on-disk
+# cache), so importers that only need elo_match_probs pay no JIT cost.
+@njit(cache=True, fastmath=True, boundscheck=False)
+def _elo_scan(home_idx, away_idx, Sh, G, w_time, n_teams,
+              init, k_base, scale, home_adv_points):
+    """Sequential Elo update over int-indexed match arrays -> (ratings, games)."""
+    ratings = np.full(n_teams, init)
+    games = np.zeros(n_teams, np.int64)
+    inv_scale_ln10 = math.log(10.0) / scale
+    for i in range(home_idx.shape[0]):
+        h = home_idx[i]
+        a = away_idx[i]
+        Rh = ratings[h]
+        Ra = ratings[a]
+        delta = (Rh + home_adv_points) - Ra
+        Eh = 1.0 / (1.0 + math.exp(-delta * inv_scale_ln10))
+        g = G[i] * (2.2 / (0.001 * abs(delta) + 2.2))
 
-def _parse_date(s: str | None) -> datetime:
-    if not s:
-        return datetime.now(timezone.utc)
-    try:
-        return datetime.fromisoformat(s.replace("Z","+00:00"))
-    except Exception:
-        return datetime.now(timezone.utc)
-
-def _half_life_weight(age_days: float, half_life_days: float) -> float:
-    if half_life_days <= 0: return 1.0
-    return 0.5 ** (age_days / half_life_days)
-
-def _expected_Elo(delta_points: float, scale: float = DEFAULT_SCALE) -> float:
-    return 1.0 / (1.0 + 10.0 ** (-delta_points / scale))
-
-def _goal_diff_factor(gd: int, delta_abs: float) -> float:
-    gd = abs(int(gd))
-    if gd <= 1:
-        G = 1.0
-    elif gd == 2:
-        G = 1.5
-    else:
-        G = (11.0 + gd) / 8.0
-    return G * (2.2 / (0.001 * delta_abs + 2.2))
+        change = k_base * w_time[i] * g * (Sh[i] - Eh)
+        ratings[h] = Rh + change
+        ratings[a] = Ra - change
+        games[h] += 1
+        games[a] += 1
+    return ratings, games
 
 def build_elo(df: pd.DataFrame,
               init: float = DEFAULT_INIT,
@@ -40,54 +47,69 @@ def build_elo(df: pd.DataFrame,
               scale: float = DEFAULT_SCALE,
               half_life_days: float = 365.0,
               home_adv_points: float = DEFAULT_HA_POINTS) -> Dict[str, Any]:
-    if df.empty:
+    # Unplayed matches (NaN goals) carry no information; drop them before any parsing.
+    played = (df["home_goals"].notna().to_numpy() & df["away_goals"].notna().to_numpy()
+              if not df.empty else np.zeros(0, dtype=bool))
+    if not played.any():
         return {"init": init, "scale": scale, "k_base": k_base,
                 "home_adv_points": home_adv_points, "draw_nu": 1.0, "teams": {}}
-
-    df = df.copy()
-    df["kick_dt"] = df["utc_date"].apply(_parse_date)
-    df = df.sort_values("kick_dt").reset_index(drop=True)
-
-    draws = (df["home_goals"] == df["away_goals"]).sum()
-    draw_rate = draws / max(len(df), 1)
+    if not played.all():
+        df = df[played]
+
+    now = pd.Timestamp.now(tz="UTC")
+    # Work on extracted, date-ordered arrays; the caller's frame is never copied.
+    kick_ns = (pd.to_datetime(df["utc_date"], utc=True, format="ISO8601", errors="coerce")
+               .fillna(now).to_numpy("datetime64[ns]").view("int64"))
+    order = np.argsort(kick_ns, kind="stable")
+    kick_ns = kick_ns[order]
+    home = df["home"].to_numpy()[order]
+    away = df["away"].to_numpy()[order]
+    hg = df["home_goals"].to_numpy(np.int64)[order]
+    ag = df["away_goals"].to_numpy(np.int64)[order]
+
+    n = hg.size
+    is_draw = hg == ag
+
+    draws = int(np.count_nonzero(is_draw))
+    draw_rate = draws / max(n, 1)
     draw_rate = min(max(float(draw_rate), 0.15), 0.35)
     draw_nu = (2.0 * draw_rate) / max(1.0 - draw_rate, 1e-6)
 
-    ratings: Dict[str, float] = {}
-    games_count: Dict[str, int] = {}
-
-    now = datetime.now(timezone.utc)
-    for _, m in df.iterrows():
-        h = m["home"]; a = m["away"]
-        hg = int(m["home_goals"]); ag = int(m["away_goals"])
-        dt = m["kick_dt"]
-        age_days = (now - dt).total_seconds()/86400.0
-        w_time = _half_life_weight(age_days, half_life_days)
-
-        Rh = ratings.get(h, init)
-        Ra = ratings.get(a, init)
-        delta = (Rh + home_adv_points) - Ra
-        Eh = _expected_Elo(delta, scale=scale)
-
-        if hg > ag:
-            Sh = 1.0
-        elif hg == ag:
-            Sh = 0.5
-        else:
-            Sh = 0.0
-
-        gd = abs(hg - ag)
-        g = _goal_diff_factor(gd, abs(delta))
-        K = k_base * w_time
-
-        change = K * g * (Sh - Eh)
-        ratings[h] = Rh + change
-        ratings[a] = Ra - change
-        games_count[h] = games_count.get(h, 0) + 1
-        games_count[a] = games_count.get(a, 0) + 1
-
-    teams = {t: {"elo": float(ratings[t]), "games": int(games_count.get(t,0))}
-             for t in ratings.keys()}
+    # Per-match constants, computed once up front so the sequential update
+    # below only touches preallocated arrays indexed by int.
+    # Interleaved (h0, a0, h1, a1, ...) so team ids, and hence the output key order,
+    # follow first appearance in play order. A missing name is its own team (as
+    # before), never the -1 sentinel, which the unchecked scan would wrap to the last id.
+    names = np.column_stack([home, away]).ravel()
+    codes, _ = pd.factorize(names, use_na_sentinel=False)
+    home_idx, away_idx = codes[0::2], codes[1::2]
+    # Codes are dense in first-appearance order; keep each team's original value (None stays None).
+    uniques = names[np.unique(codes, return_index=True)[1]]
+
+    Sh = np.where(hg > ag, 1.0, np.where(is_draw, 0.5, 0.0))
+    gd = np.abs(hg - ag)
+    # Goal-difference multiplier; only the |delta| damping depends on ratings.
+    G = _G_ARRAY[np.minimum(gd, len(_G_ARRAY) - 1)]
+    big = gd >= len(_G_ARRAY)
+    if big.any():
+        G[big] = (11.0 + gd[big]) / 8.0
+
+    age_days = (now.value - kick_ns) / 86_400e9
+    w_time = 0.5 ** (age_days / half_life_days) if half_life_days > 0 else np.ones(n)
+
+    # Fixed dtypes so every call reuses one compiled specialisation (no-op casts when already matching).
+    ratings, games_count = _elo_scan(home_idx.astype(np.int64, copy=False),
+                                     away_idx.astype(np.int64, copy=False),
+                                     Sh.astype(np.float64, copy=False),
+                                     G.astype(np.float64, copy=False),
+                                     w_time.astype(np.float64, copy=False), len(uniques),
+                                     float(init), float(k_base), float(scale),
+                                     float(home_adv_points))
+
+    # Map the int-indexed stores back to team names only once, at the end.
+    teams = {t: {"elo": r, "games": g}
+             for t, r, g in zip(uniques.tolist(), ratings.tolist(), games_count.tolist())
+             if g > 0}
 
     return {
         "init": float(init),
@@ -103,14 +125,10 @@ def elo_match_probs(elo_h: float, elo_a: float,
                     scale: float,
                     draw_nu: float) -> tuple[float,float,float]:
     delta = (elo_h + home_adv_points) - elo_a
-    r = 10.0 ** (delta / max(scale, 1e-6))
-    r_sqrt = math.sqrt(r)
-    denom = r + 1.0 + draw_nu * r_sqrt
-    if denom <= 0:
-        return 1/3, 1/3, 1/3
-    pH = r / denom
-    pD = (draw_nu * r_sqrt) / denom
-    pA = 1.0 / denom
-    s = pH + pD + pA
-    if s <= 0: return 1/3,1/3,1/3
-    return pH/s, pD/s, pA/s
+    # Divide the Davidson form (r, nu*sqrt(r), 1) through by sqrt(r) = x:
+    # symmetric in x and 1/x, so it neither overflows nor needs a renorm.
+    half = delta * (_LN10 / (2.0 * max(scale, 1e-6)))
+    x = math.exp(max(min(half, 700.0), -700.0))
+    inv = 1.0 / x
+    denom = x + inv + draw_nu
+    return x / denom, draw_nu / denom, inv / denom
@@ -2,21 +2,83 @@
 from __future__ import annotations
 
 import datetime as _dt
+import functools
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Callable, Dict, Iterable, List, Optional
 
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to requests' stdlib json decoding
+    orjson = None
+
+_RESULT_COLUMNS = ["utc_date", "season", "home", "away", "home_goals", "away_goals"]
+_FIXTURE_COLUMNS = ["match_id", "utc_date", "home", "away", "competition"]
+
+# Upper bound on concurrent season fetches (the free API tier is rate limited).
+_MAX_FETCH_WORKERS = 8
+
+
+def _mount_adapter(session: requests.Session) -> requests.Session:
+    """Pooled keep-alive adapter that retries 429/5xx with backoff (honours Retry-After)."""
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.5,
+                          status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False),
+    ))
+    return session
+
+
+# One keep-alive session for all football-data calls.
+_SESSION = _mount_adapter(requests.Session())
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_session(cache_dir: str) -> Any:
+    """
+    SQLite-backed requests_cache session, or None if requests_cache is missing.
+
+    Opt-in: only used when PLPRED_HTTP_CACHE_DIR is set and requests_cache is
+    installed (it is not a pinned dependency); otherwise calls go through _SESSION.
+
+    Entries honour the server's Cache-Control and otherwise go stale after an hour;
+    stale entries are revalidated with If-None-Match / If-Modified-Since, so
+    unchanged (historical) seasons come back as bodiless 304s. If revalidation
+    fails (network error or error status), the stale copy is served instead.
+    """
+    try:
+        import requests_cache
+    except ImportError:
+        return None
+    # Same pooling and retry policy as _SESSION; only cache misses reach the adapter.
+    return _mount_adapter(requests_cache.CachedSession(
+        os.path.join(cache_dir, "fd_http"), backend="sqlite",
+        cache_control=True, expire_after=3600, stale_if_error=True))
 
 
 def _http_get(url: str, *, headers: Optional[Dict[str, str]] = None,
               params: Optional[Dict[str, Any]] = None, timeout: int = 20) -> requests.Response:
-    return requests.get(url, headers=headers or {}, params=params or {}, timeout=timeout)
+    cache_dir = os.getenv("PLPRED_HTTP_CACHE_DIR")
+    session = _cached_session(cache_dir) if cache_dir else None
+    getter = session.get if session is not None else _SESSION.get
+    return getter(url, headers=headers or {}, params=params or {}, timeout=timeout)
 
 
 def _coerce_json(obj: Any) -> Dict[str, Any]:
     if isinstance(obj, dict):
         return obj
+    content = getattr(obj, "content", None)
+    if orjson is not None and isinstance(content, (bytes, bytearray)):
+        try:
+            return orjson.loads(content) or {}
+        except orjson.JSONDecodeError:
+            return {}
     if hasattr(obj, "json"):
         try:
             return obj.json() or {}
@@ -28,9 +90,116 @@ def _coerce_json(obj: Any) -> Dict[str, Any]:
         return {}
 
 
+_RAISE_FOR_STATUS = requests.Response.raise_for_status
+
+
+def _raise_for_status(r: Any) -> None:
+    """
+    Raise requests.HTTPError on an HTTP error status; real Responses skip the
+    duck-typed attribute probe. Whatever an injected double raises is re-raised
+    as HTTPError, so callers can catch status errors without also swallowing
+    transport failures (ConnectionError, Timeout, ...).
+    """
+    if isinstance(r, requests.Response):
+        _RAISE_FOR_STATUS(r)
+        return
+    check = getattr(r, "raise_for_status", None)  # injected test doubles
+    if check is not None:
+        try:
+            check()
+        except requests.HTTPError:
+            raise
+        except Exception as e:
+            raise requests.HTTPError(str(e)) from e
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_get_json(url: str, params_key: tuple, token: Optional[str]) -> Dict[str, Any]:
+    headers = {"X-Auth-Token": token} if token else {}
+    r = _http_get(url, headers=headers, params=dict(params_key))
+    _raise_for_status(r)
+    return _coerce_json(r)
+
+
+def _get_json(http_get: Callable[..., Any], url: str, *,
+              headers: Dict[str, str], params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    GET `url`, raise on HTTP errors and return the decoded payload.
+
+    Calls through the default transport are memoised per (url, params, token),
+    so repeated league/season queries within one process hit the API once.
+    The cached dict is shared between callers: treat it as read-only.
+    """
+    if http_get is _http_get:
+        return _cached_get_json(url, tuple(sorted(params.items())), headers.get("X-Auth-Token"))
+    r = http_get(url, headers=headers, params=params)
+    _raise_for_status(r)
+    return _coerce_json(r)
+
+
+def _results_to_df(matches: List[Dict[str, Any]], season: int) -> pd.DataFrame:
+    """Finished-match payload -> results frame (one tuple per match)."""
+    season = int(season)
+    rows = []
+    for m in matches:
+        # The v4 schema is fixed: subscript directly and skip malformed matches.
+        try:
+            ft = m["score"]["fullTime"]
+            hg, ag = ft["home"], ft["away"]
+            if hg is None or ag is None:
+                continue
+            rows.append((m["utcDate"], season, m["homeTeam"]["name"], m["awayTeam"]["name"],
+                         int(hg), int(ag)))
+        except (KeyError, TypeError):
+            continue
+    return pd.DataFrame.from_records(rows, columns=_RESULT_COLUMNS)
+
+
+def _fixtures_to_df(matches: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Scheduled-match payload -> fixtures frame, built column by column."""
+    return pd.DataFrame({
+        "match_id": [m.get("id") for m in matches],
+        "utc_date": [m.get("utcDate") for m in matches],
+        "home": [(m.get("homeTeam") or {}).get("name") for m in matches],
+        "away": [(m.get("awayTeam") or {}).get("name") for m in matches],
+        "competition": [(m.get("competition") or {}).get("code") for m in matches],
+    }, columns=_FIXTURE_COLUMNS)
+
+
 # -------------------------------
 # Results (finished matches)
 # -------------------------------
+def _fetch_seasons(http_get: Callable[..., Any], headers: Dict[str, str],
+                   league: str, seasons: List[int]) -> pd.DataFrame:
+    """Finished matches for several seasons, concatenated in input order."""
+    url = f"https://api.football-data.org/v4/competitions/{league}/matches"
+
+    def _season_frame(s: int) -> Optional[pd.DataFrame]:
+        params = {"season": int(s), "status": "FINISHED"}
+        try:
+            data = _get_json(http_get, url, headers=headers, params=params)
+        except requests.HTTPError:
+            return None
+
+        frame = _results_to_df(data.get("matches", []), s)
+        return frame if len(frame) else None
+
+    # Seasons are independent network round-trips; fetch each distinct one
+    # concurrently (duplicates would all miss the memo cache at once), then
+    # expand back to the input order.
+    unique = list(dict.fromkeys(seasons))
+    if len(unique) > 1:
+        with ThreadPoolExecutor(max_workers=min(_MAX_FETCH_WORKERS, len(unique))) as pool:
+            by_season = dict(zip(unique, pool.map(_season_frame, unique)))
+    else:
+        by_season = {s: _season_frame(s) for s in unique}
+    frames = [by_season[s] for s in seasons if by_season[s] is not None]
+
+    if frames:
+        return pd.concat(frames, ignore_index=True)
+    return pd.DataFrame(columns=_RESULT_COLUMNS)
+
+
 def fetch_results(*args, **kwargs) -> pd.DataFrame:
     """
     Legacy (tests):
@@ -38,6 +207,7 @@ def fetch_results(*args, **kwargs) -> pd.DataFrame:
 
     Modern (prod):
         fetch_results(league='PL', season=2024, http_get=None)
+        fetch_results(league='PL', seasons=[2024, 2025], http_get=None)
 
     Legacy mode **must** return columns exactly:
       ["utc_date","season","home","away","home_goals","away_goals"]
@@ -46,8 +216,6 @@ def fetch_results(*args, **kwargs) -> pd.DataFrame:
     token = os.getenv("FOOTBALL_DATA_TOKEN")
     headers = {"X-Auth-Token": token} if token else {}
 
-    frames: List[pd.DataFrame] = []
-
     # detect legacy positional: (session, league, seasons_list)
     if len(args) >= 3 and isinstance(args[1], str):
         league = args[1]
@@ -57,72 +225,21 @@ def fetch_results(*args, **kwargs) -> pd.DataFrame:
         else:
             seasons = [int(seasons_arg)]
 
-        for s in seasons:
-            url = f"https://api.football-data.org/v4/competitions/{league}/matches"
-            params = {"season": int(s), "status": "FINISHED"}
-            try:
-                r = http_get(url, headers=headers, params=params)
-                if hasattr(r, "raise_for_status"):
-                    try:
-                        r.raise_for_status()
-                    except Exception:
-                        continue
-                data = _coerce_json(r)
-            except requests.HTTPError:
-                continue
-
-            rows: List[Dict[str, Any]] = []
-            for m in data.get("matches", []):
-                ft = (m.get("score") or {}).get("fullTime") or {}
-                hg, ag = ft.get("home"), ft.get("away")
-                if hg is None or ag is None:
-                    continue
-                rows.append({
-                    "utc_date": m.get("utcDate"),
-                    "season": int(s),
-                    "home": ((m.get("homeTeam") or {}).get("name")),
-                    "away": ((m.get("awayTeam") or {}).get("name")),
-                    "home_goals": int(hg),
-                    "away_goals": int(ag),
-                })
-            if rows:
-                frames.append(pd.DataFrame(
-                    rows,
-                    columns=["utc_date", "season", "home", "away", "home_goals", "away_goals"]
-                ))
-
-        if frames:
-            return pd.concat(frames, ignore_index=True)
-        return pd.DataFrame(columns=["utc_date", "season", "home", "away", "home_goals", "away_goals"])
+        return _fetch_seasons(http_get, headers, league, seasons)
 
     # modern path (not used by tests; keep richer schema if you want)
     league = kwargs.get("league") or (args[0] if args else None)
+    if kwargs.get("seasons") is not None:
+        return _fetch_seasons(http_get, headers, league, [int(x) for x in kwargs["seasons"]])
     season = int(kwargs.get("season") or (args[1] if len(args) >= 2 else 0))
     url = f"https://api.football-data.org/v4/competitions/{league}/matches"
     params = {"season": season, "status": "FINISHED"}
     try:
-        r = http_get(url, headers=headers, params=params)
-        if hasattr(r, "raise_for_status"):
-            r.raise_for_status()
-        data = _coerce_json(r)
-    except Exception:
-        return pd.DataFrame(columns=["utc_date", "season", "home", "away", "home_goals", "away_goals"])
+        data = _get_json(http_get, url, headers=headers, params=params)
+    except requests.HTTPError:
+        return pd.DataFrame(columns=_RESULT_COLUMNS)
 
-    rows = []
-    for m in data.get("matches", []):
-        ft = (m.get("score") or {}).get("fullTime") or {}
-        hg, ag = ft.get("home"), ft.get("away")
-        if hg is None or ag is None:
-            continue
-        rows.append({
-            "utc_date": m.get("utcDate"),
-            "season": int(season),
-            "home": ((m.get("homeTeam") or {}).get("name")),
-            "away": ((m.get("awayTeam") or {}).get("name")),
-            "home_goals": int(hg),
-            "away_goals": int(ag),
-        })
-    return pd.DataFrame(rows, columns=["utc_date", "season", "home", "away", "home_goals", "away_goals"])
+    return _results_to_df(data.get("matches", []), season)
 
 
 # -------------------------------
@@ -153,13 +270,10 @@ def fetch_fixtures(*args, **kwargs):
             date_to = args[3] if len(args) >= 4 else date_from
             url = f"https://api.football-data.org/v4/competitions/{league}/matches"
             params = {"status": "SCHEDULED", "dateFrom": date_from, "dateTo": date_to}
-            r = http_get(url, headers=headers, params=params)
-            if hasattr(r, "raise_for_status"):
-                try:
-                    r.raise_for_status()
-                except Exception:
-                    return []  # <- tests expect empty list on error
-            data = _coerce_json(r)
+            try:
+                data = _get_json(http_get, url, headers=headers, params=params)
+            except requests.HTTPError:
+                return []  # <- tests expect empty list on error
             # In legacy success path we could return a list, but tests only hit error path.
             rows = [{
                 "match_id": m.get("id"),
@@ -177,20 +291,49 @@ def fetch_fixtures(*args, **kwargs):
         date_to = (today + _dt.timedelta(days=days)).isoformat()
         url = "https://api.football-data.org/v4/matches"
         params = {"status": "SCHEDULED", "dateFrom": date_from, "dateTo": date_to}
-        r = http_get(url, headers=headers, params=params)
-        if hasattr(r, "raise_for_status"):
-            try:
-                r.raise_for_status()
-            except Exception:
-                return pd.DataFrame(columns=["match_id", "utc_date", "home", "away", "competition"])
-        data = _coerce_json(r)
-        rows = [{
-            "match_id": m.get("id"),
-            "utc_date": m.get("utcDate"),
-            "home": ((m.get("homeTeam") or {}).get("name")),
-            "away": ((m.get("awayTeam") or {}).get("name")),
-            "competition": ((m.get("competition") or {}).get("code")),
-        } for m in data.get("matches", [])]
-        return pd.DataFrame(rows, columns=["match_id", "utc_date", "home", "away", "competition"])
+        try:
+            data = _get_json(http_get, url, headers=headers, params=params)
+        except requests.HTTPError:
+            return pd.DataFrame(columns=_FIXTURE_COLUMNS)
+        return _fixtures_to_df(data.get("matches", []))
+    except requests.HTTPError:
+        return [] if legacy else pd.DataFrame(columns=_FIXTURE_COLUMNS)
+
+
+def fetch_fixtures_multi(leagues: Iterable[str], days: int = 14, token: Optional[str] = None,
+                         http_get: Optional[Callable[..., Any]] = None,
+                         status: str = "SCHEDULED") -> Dict[str, pd.DataFrame]:
+    """
+    Fetch upcoming fixtures for several competitions in one round-trip via
+    `/v4/matches?competitions=PL,CL,...` and split the result per league.
+
+    `status` is passed through as the API's status filter and may be a
+    comma-separated list (e.g. "SCHEDULED,TIMED" to include fixtures whose
+    kickoff time is already confirmed).
+
+    Returns {league_code: DataFrame}; every requested league has an entry
+    (empty frame if it has no fixtures or the request failed).
+    """
+    http_get = http_get or _http_get
+    token = token or os.getenv("FOOTBALL_DATA_TOKEN")
+    headers = {"X-Auth-Token": token} if token else {}
+    leagues = [str(lg) for lg in leagues]
+
+    today = _dt.date.today()
+    params = {
+        "competitions": ",".join(leagues),
+        "status": status,
+        "dateFrom": today.isoformat(),
+        "dateTo": (today + _dt.timedelta(days=int(days))).isoformat(),
+    }
+    try:
+        data = _get_json(http_get, "https://api.football-data.org/v4/matches",
+                         headers=headers, params=params)
+        df = _fixtures_to_df(data.get("matches", []))
     except requests.HTTPError:
-        return [] if legacy else pd.DataFrame(columns=["match_id", "utc_date", "home", "away", "competition"])
+        df = pd.DataFrame(columns=_FIXTURE_COLUMNS)
+
+    out = {lg: df.iloc[0:0].reset_index(drop=True) for lg in leagues}
+    for code, part in df.groupby("competition", sort=False):
+        out[code] = part.reset_index(drop=True)
+    return out
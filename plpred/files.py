@@ -0,0 +1,79 @@
+# plpred/files.py
+"""
+Atomic file publishing and JSON read/write shared by the pipeline scripts.
+
+orjson is optional: when it is missing, or cannot serialise a value (non-str
+keys), the stdlib json module is used instead. Either way NaN/inf are written as
+null, so outputs are valid JSON and do not depend on which encoder is installed.
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json is the fallback
+    orjson = None
+
+PathLike = Union[str, Path]
+
+
+def atomic_write(path: PathLike, data: bytes) -> None:
+    """
+    Write `data` to a sibling temp file, fsync it, then rename it over `path`.
+    An interrupted run leaves the previous file intact instead of a truncated one.
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _finite(obj: Any) -> Any:
+    """Copy of `obj` with non-finite floats replaced by None (orjson's behaviour)."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _finite(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(v) for v in obj]
+    return obj
+
+
+def dumps_json(obj: Any, compact: bool = False) -> bytes:
+    """Serialise `obj` as UTF-8 JSON bytes; indented by default, compact on request."""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | (0 if compact else orjson.OPT_INDENT_2)
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            pass  # e.g. non-str dict keys; stdlib json coerces those
+    kwargs = {"separators": (",", ":")} if compact else {"indent": 2}
+    try:
+        text = json.dumps(obj, allow_nan=False, **kwargs)
+    except ValueError:  # NaN/inf somewhere; write null like orjson does
+        text = json.dumps(_finite(obj), **kwargs)
+    return text.encode("utf-8")
+
+
+def write_json(path: PathLike, obj: Any, compact: bool = False) -> None:
+    """Atomically publish `obj` as JSON at `path`."""
+    atomic_write(path, dumps_json(obj, compact=compact))
+
+
+def read_json(path: PathLike) -> Any:
+    """Parse the JSON file at `path`."""
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN literals, which only stdlib json accepts
+    return json.loads(data)
@@ -2,4 +2,10 @@ import logging, os
 
 def setup(level: str | None = None) -> None:
     lvl = (level or os.getenv("LOG_LEVEL") or "INFO").upper()
-    logging.basicConfig(level=lvl, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    # Our format never shows thread/process info; skip collecting it per record.
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    # force=True: replace handlers a host/test harness may already have installed.
+    logging.basicConfig(level=lvl, format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+                        force=True)
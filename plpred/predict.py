@@ -2,12 +2,16 @@
 from __future__ import annotations
 
 import json
-import math
 import re
 from collections import Counter
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Tuple, List, Any
 
+import numpy as np
+
+from ._kernels import poisson_1x2, poisson_1x2_batch, poisson_pmf
+
 
 # --------------------------
 # Canonicalisation & mapping
@@ -22,62 +26,73 @@ _ALIAS_OVERRIDES = {
 }
 
 _CANON_RE = re.compile(r"[^a-z0-9]+")
+_FC_RE = re.compile(r"\b(?:afc|a\.?f\.?c\.?|fc)\b")
 
-
+@lru_cache(maxsize=2048)
 def canon_team(name: str) -> str:
     """Normalise a team display name to a canonical key."""
     if not name:
         return ""
-    s = name.lower().strip()
-    s = s.replace("&", "and")
+    s = name.lower().replace("&", "and")
     # Remove explicit FC/AFC tokens
-    s = re.sub(r"\b(?:afc|a\.?f\.?c\.?|fc)\b", "", s)
-    # Collapse punctuation/whitespace
+    s = _FC_RE.sub("", s)
+    # Collapse punctuation/whitespace (a run of either becomes one space)
     s = _CANON_RE.sub(" ", s).strip()
-    s = re.sub(r"\s+", " ", s)
     # Alias overrides (if any)
     s = _ALIAS_OVERRIDES.get(s, s)
     return s
 
 
-def _build_canon_index(team_dict: Dict[str, Any]) -> Dict[str, str]:
+@dataclass
+class _Resolver:
+    canon: Dict[str, str]          # canonical form -> original ratings key
+    tokens: Dict[str, List[str]]   # token -> canonical forms containing it
+    rank: Dict[str, int]           # canonical form -> insertion order (tie-break)
+
+
+def _build_resolver(team_dict: Dict[str, Any]) -> _Resolver:
     """
-    Build an index mapping canonical form -> original key for a ratings['teams'] dict.
+    Build the canonical index (canonical form -> original key) for a ratings['teams']
+    dict plus a token -> canonical-forms inverted index for the fuzzy fallback.
     Keys in ratings might be 'Arsenal' or 'Arsenal FC'; the index lets us resolve either.
+    Build it once per ratings (see `compile_ratings`) and pass it to `resolve_team_key`.
     """
-    idx = {}
+    canon: Dict[str, str] = {}
     for k in team_dict.keys():
-        idx[canon_team(k)] = k
-    return idx
+        canon[canon_team(k)] = k
+    tokens: Dict[str, List[str]] = {}
+    for ck in canon:
+        for t in set(ck.split()):
+            tokens.setdefault(t, []).append(ck)
+    return _Resolver(canon=canon, tokens=tokens, rank={ck: i for i, ck in enumerate(canon)})
 
 
-def resolve_team_key(name: str, ratings: Dict[str, Any]) -> Tuple[str | None, str]:
+def resolve_team_key(name: str, ratings: Dict[str, Any],
+                     resolver: _Resolver | None = None) -> Tuple[str | None, str]:
     """
     Map a fixture name to a ratings key.
 
+    `resolver` is the prebuilt index for ratings['teams'] (from `compile_ratings`);
+    without it the index is rebuilt for this call.
     Returns (ratings_key_or_None, resolution_note).
     """
     teams = ratings.get("teams", {})
     if not teams:
         return None, "no-teams-in-ratings"
 
-    cidx = _build_canon_index(teams)
+    res = resolver if resolver is not None else _build_resolver(teams)
 
     c = canon_team(name)
     # Direct canonical hit
-    if c in cidx:
-        return cidx[c], "direct"
-
-    # Very simple token-based fallback: pick the ratings key with max token overlap
-    tokens = set(c.split())
-    best_key, best_score = None, -1
-    for ck, original in cidx.items():
-        score = len(tokens.intersection(set(ck.split())))
-        if score > best_score:
-            best_key, best_score = original, score
+    if c in res.canon:
+        return res.canon[c], "direct"
 
-    if best_score > 0:
-        return best_key, "token-match"
+    # Token-based fallback: pick the ratings key with max token overlap
+    # (earliest key wins ties), scoring only keys that share a token.
+    scores = Counter(ck for t in set(c.split()) for ck in res.tokens.get(t, ()))
+    if scores:
+        best = max(scores, key=lambda ck: (scores[ck], -res.rank[ck]))
+        return res.canon[best], "token-match"
 
     return None, "unmatched"
 
@@ -86,102 +101,130 @@ def resolve_team_key(name: str, ratings: Dict[str, Any]) -> Tuple[str | None, st
 # Outcome probabilities (Poisson + draw scaling)
 # --------------------------
 
-def _pois(k: int, lam: float) -> float:
-    lam = max(float(lam), 1e-9)
-    return math.exp(-lam) * lam**k / math.factorial(k)
+def _pmf(lam: float, cap: int) -> np.ndarray:
+    """Poisson PMF for k = 0..cap as a vector."""
+    return poisson_pmf(float(lam), int(cap))
 
 
-def outcome_probs(lam_home: float, lam_away: float, draw_scale: float = 1.0) -> Tuple[float, float, float]:
+def _grid(lam_home: float, lam_away: float, cap: int) -> np.ndarray:
+    """(cap+1, cap+1) scoreline probabilities; g[i, j] = P(home=i) * P(away=j)."""
+    return np.outer(_pmf(lam_home, cap), _pmf(lam_away, cap))
+
+
+@lru_cache(maxsize=4096)
+def _probs_cached(lam_home: float, lam_away: float, cap: int, draw_scale: float) -> Tuple[float, float, float]:
+    return poisson_1x2(lam_home, lam_away, cap, draw_scale)
+
+
+def outcome_probs(lam_home: float, lam_away: float, draw_scale: float = 1.0,
+                  cap: int = 12) -> Tuple[float, float, float]:
     """
     Return (P_home, P_draw, P_away) using independent Poisson with optional draw scaling.
+
+    Goals are truncated at `cap` (12 keeps it numerically stable & fast). Inputs are
+    quantised (rates to 4dp, draw_scale to 3dp) and memoised, as fixture lists
+    repeat the same expected goals until ratings are rebuilt.
+    """
+    return _probs_cached(round(float(lam_home), 4), round(float(lam_away), 4),
+                         int(cap), round(float(draw_scale), 3))
+
+
+def outcome_probs_batch(lam_home: Any, lam_away: Any, draw_scale: float = 1.0,
+                        cap: int = 12) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorised `outcome_probs` over a whole fixture list.
+
+    Takes equal-length arrays of expected goals and returns (P_home, P_draw, P_away)
+    arrays; same kernel as the scalar path, looped over fixtures in compiled code.
     """
-    max_g = 12  # cap to keep numerical stable & fast
-    ph = pd = pa = 0.0
-
-    for i in range(0, max_g + 1):
-        pi = _pois(i, lam_home)
-        for j in range(0, max_g + 1):
-            pj = _pois(j, lam_away)
-            p = pi * pj
-            if i > j:
-                ph += p
-            elif i == j:
-                pd += p
-            else:
-                pa += p
-
-    if draw_scale != 1.0:
-        # Reweight draws and renormalise
-        pd *= draw_scale
-        s = ph + pd + pa
-        if s > 0:
-            ph /= s
-            pd /= s
-            pa /= s
-
-    return ph, pd, pa
+    lam_h = np.ascontiguousarray(lam_home, dtype=np.float64).ravel()
+    lam_a = np.ascontiguousarray(lam_away, dtype=np.float64).ravel()
+    return poisson_1x2_batch(lam_h, lam_a, int(cap), float(draw_scale))
+
+
+@lru_cache(maxsize=4096)
+def _top_cached(lam_home: float, lam_away: float, k: int, cap: int) -> Tuple[Tuple[int, int, float], ...]:
+    g = _grid(lam_home, lam_away, cap)
+    flat = g.ravel()
+    if k <= 0:
+        return ()
+    if k < flat.size:
+        # Partition to the k-th largest, keep every cell tied with it, then a stable
+        # sort so ties still come out in row-major (home, away) order.
+        kth = np.partition(flat, flat.size - k)[flat.size - k]
+        cand = np.flatnonzero(flat >= kth)
+    else:
+        cand = np.arange(flat.size)
+    top = cand[np.argsort(-flat[cand], kind="stable")][:k]
+    rows, cols = np.divmod(top, g.shape[1])
+    return tuple(zip(rows.tolist(), cols.tolist(), flat[top].tolist()))
 
 
 def top_scorelines(lam_home: float, lam_away: float, k: int = 3, cap: int = 8) -> List[Dict[str, Any]]:
     """
-    Return top-k most likely scorelines with probs.
+    Return top-k most likely scorelines with probs (memoised like `outcome_probs`).
     """
-    out = []
-    for i in range(0, cap + 1):
-        pi = _pois(i, lam_home)
-        for j in range(0, cap + 1):
-            pj = _pois(j, lam_away)
-            out.append({"home_goals": i, "away_goals": j, "prob": pi * pj})
-    out.sort(key=lambda r: r["prob"], reverse=True)
-    return out[:k]
+    cells = _top_cached(round(float(lam_home), 4), round(float(lam_away), 4), int(k), int(cap))
+    return [{"home_goals": i, "away_goals": j, "prob": p} for i, j, p in cells]
 
 
 # --------------------------
 # Expected goals per fixture
 # --------------------------
 
-@dataclass
-class Strengths:
-    att: float = 1.0
-    deff: float = 1.0  # 'def' is reserved in Python, so use 'deff'
-    att_h: float = 1.0
-    deff_h: float = 1.0
-    att_a: float = 1.0
-    deff_a: float = 1.0
-
-
-def _get_strengths(key: str | None, ratings: Dict[str, Any]) -> Strengths:
-    if not key:
-        return Strengths()
-    t = ratings.get("teams", {}).get(key, {})
-    return Strengths(
-        att=float(t.get("att", 1.0)),
-        deff=float(t.get("def", 1.0)),
-        att_h=float(t.get("att_h", t.get("att", 1.0))),
-        deff_h=float(t.get("def_h", t.get("def", 1.0))),
-        att_a=float(t.get("att_a", t.get("att", 1.0))),
-        deff_a=float(t.get("def_a", t.get("def", 1.0))),
-    )
-
-
-def expected_goals_for_pair(home_name: str, away_name: str, ratings: Dict[str, Any]) -> Tuple[float, float, Dict[str, Any]]:
+def compile_ratings(ratings: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten ratings['teams'] into per-factor NumPy arrays indexed by team id.
+
+    Returns {"team_to_id": {key: i}, "att_h", "def_h", "att_a", "def_a": ndarray,
+    "base_home": float, "base_away": float, "resolver": name index}. Venue factors
+    fall back to the overall att/def, then 1.0. Not cached: compile once per
+    ratings snapshot and pass the result to `expected_goals_for_pair`; recompile
+    after changing the ratings.
+    """
+    teams = ratings.get("teams", {})
+
+    rows = list(teams.values())
+    def _col(name: str, fallback: str) -> np.ndarray:
+        return np.fromiter((float(t.get(name, t.get(fallback, 1.0))) for t in rows),
+                           dtype=np.float64, count=len(rows))
+
+    compiled = {
+        "team_to_id": {k: i for i, k in enumerate(teams)},
+        "att_h": _col("att_h", "att"),
+        "def_h": _col("def_h", "def"),
+        "att_a": _col("att_a", "att"),
+        "def_a": _col("def_a", "def"),
+        # League baselines; keep previous defaults if not present
+        "base_home": float(ratings.get("base_home_xg", ratings.get("league_home_xg", 1.45))),
+        "base_away": float(ratings.get("base_away_xg", ratings.get("league_away_xg", 1.35))),
+        "resolver": _build_resolver(teams),
+    }
+    return compiled
+
+
+def expected_goals_for_pair(home_name: str, away_name: str, ratings: Dict[str, Any],
+                            compiled: Dict[str, Any] | None = None) -> Tuple[float, float, Dict[str, Any]]:
     """
     Compute (lambda_home, lambda_away, debug_note) using league baselines and team strengths.
     This is where we ensure **per-match variation** by actually using the resolved team strengths.
+    Pass `compiled=compile_ratings(ratings)` when pricing many fixtures against one ratings.
     """
-    # League baselines; keep previous defaults if not present
-    base_home = float(ratings.get("base_home_xg", ratings.get("league_home_xg", 1.45)))
-    base_away = float(ratings.get("base_away_xg", ratings.get("league_away_xg", 1.35)))
+    cr = compiled if compiled is not None else compile_ratings(ratings)
 
-    key_h, how_h = resolve_team_key(home_name, ratings)
-    key_a, how_a = resolve_team_key(away_name, ratings)
+    key_h, how_h = resolve_team_key(home_name, ratings, cr["resolver"])
+    key_a, how_a = resolve_team_key(away_name, ratings, cr["resolver"])
 
-    sh = _get_strengths(key_h, ratings)
-    sa = _get_strengths(key_a, ratings)
+    i_h = cr["team_to_id"].get(key_h)
+    i_a = cr["team_to_id"].get(key_a)
+    att_h = cr["att_h"][i_h] if i_h is not None else 1.0
+    def_h = cr["def_h"][i_h] if i_h is not None else 1.0
+    att_a = cr["att_a"][i_a] if i_a is not None else 1.0
+    def_a = cr["def_a"][i_a] if i_a is not None else 1.0
 
     # Attack vs defence: multiplicative adjustment
-    lam_h = base_home * sh.att_h / max(sa.deff_a, 1e-6)
-    lam_a = base_away * sa.att_a / max(sh.deff_h, 1e-6)
+    lam_h = float(cr["base_home"] * att_h / max(def_a, 1e-6))
+    lam_a = float(cr["base_away"] * att_a / max(def_h, 1e-6))
 
     # Sanity caps
     lam_h = max(0.2, min(lam_h, 3.5))
@@ -2,16 +2,28 @@
 from __future__ import annotations
 
 from typing import Dict, Any
+import numpy as np
 import pandas as pd
 
 
-def _safe_ratio(num: float, den: float, default: float) -> float:
-    try:
-        if den and den != 0:
-            return float(num) / float(den)
-    except Exception:
-        pass
-    return float(default)
+def _goals(col: pd.Series) -> np.ndarray:
+    """Goals as ints; only non-numpy-integer columns pay for the numeric coercion."""
+    # numpy int/uint only: nullable Int64 can hold <NA>, which must still become 0
+    if isinstance(col.dtype, np.dtype) and col.dtype.kind in "iu":
+        return col.to_numpy()
+    return pd.to_numeric(col, errors="coerce").fillna(0).astype(int).to_numpy()
+
+
+def _factor(goals: np.ndarray, games: np.ndarray, league_rate: float) -> np.ndarray:
+    """
+    Per-game rate relative to `league_rate`, elementwise.
+    Zero-game teams, zero factors and an unknown league rate all fall back to 1.0.
+    """
+    if not league_rate:
+        return np.ones(len(goals))
+    rate = np.divide(goals, games, out=np.zeros(len(goals)), where=games > 0)
+    f = rate / league_rate
+    return np.where(f != 0, f, 1.0)
 
 
 def build_ratings(
@@ -52,97 +64,65 @@ def build_ratings(
             "home_adv": 1.05,        # mild home edge default
         }
 
-    df = matches.copy()
+    df = matches  # read-only below; never copied or mutated
 
     required = {"home", "away", "home_goals", "away_goals"}
     missing = required - set(df.columns)
     if missing:
         raise ValueError(f"build_ratings: missing columns {sorted(missing)}")
 
-    # Ensure numeric ints for goals
-    for c in ("home_goals", "away_goals"):
-        df[c] = pd.to_numeric(df[c], errors="coerce").fillna(0).astype(int)
-
-    # --- Aggregate home and away with explicit 'team' column ---
-    home_stats = (
-        df.groupby("home", dropna=False)
-        .agg(
-            gf_h=("home_goals", "sum"),
-            ga_h=("away_goals", "sum"),
-            gp_h=("home_goals", "size"),
-        )
-        .rename_axis("team")
-        .reset_index()
-    )
-
-    away_stats = (
-        df.groupby("away", dropna=False)
-        .agg(
-            gf_a=("away_goals", "sum"),
-            ga_a=("home_goals", "sum"),
-            gp_a=("away_goals", "size"),
-        )
-        .rename_axis("team")
-        .reset_index()
-    )
-
-    # Outer join ensures teams with only home or only away games are included
-    base = home_stats.merge(away_stats, on="team", how="outer").fillna(0)
-    # integer-cast the counts/sums we created
-    for c in ("gf_h", "ga_h", "gp_h", "gf_a", "ga_a", "gp_a"):
-        base[c] = base[c].astype(int)
-
+    # --- Aggregate home and away in one pass over shared team codes ---
+    # A single (sorted) factorisation of home+away names, then bincount per stat;
+    # teams with only home or only away games simply get zeros on the other side.
+    n = len(df)
+    codes, teams_u = pd.factorize(pd.concat([df["home"], df["away"]], ignore_index=True),
+                                  sort=True, use_na_sentinel=False)
+    h_idx, a_idx = codes[:n], codes[n:]
+    k = len(teams_u)
+    hg = _goals(df["home_goals"]).astype(np.float64)
+    ag = _goals(df["away_goals"]).astype(np.float64)
+    # Per-team totals stay plain float arrays aligned with `teams_u`.
+    gf_h = np.bincount(h_idx, weights=hg, minlength=k)
+    ga_h = np.bincount(h_idx, weights=ag, minlength=k)
+    gp_h = np.bincount(h_idx, minlength=k).astype(np.float64)
+    gf_a = np.bincount(a_idx, weights=ag, minlength=k)
+    ga_a = np.bincount(a_idx, weights=hg, minlength=k)
+    gp_a = np.bincount(a_idx, minlength=k).astype(np.float64)
     # Totals
-    base["gf"] = base["gf_h"] + base["gf_a"]
-    base["ga"] = base["ga_h"] + base["ga_a"]
-    base["gp"] = base["gp_h"] + base["gp_a"]
+    gf = gf_h + gf_a
+    ga = ga_h + ga_a
+    gp = gp_h + gp_a
 
     # League baselines (guarded)
-    lg_gp_h = int(base["gp_h"].sum())
-    lg_gp_a = int(base["gp_a"].sum())
-    lg_gp_all = int(base["gp"].sum())
+    lg_gp_h = int(gp_h.sum())
+    lg_gp_a = int(gp_a.sum())
+    lg_gp_all = int(gp.sum())
 
-    lg_h_scored = _safe_ratio(base["gf_h"].sum(), lg_gp_h, default=1.30)   # ~typical home GPG
-    lg_a_scored = _safe_ratio(base["gf_a"].sum(), lg_gp_a, default=1.30)   # ~typical away GPG
-    lg_all_scored = _safe_ratio(base["gf"].sum(), lg_gp_all, default=2.60) # league GPG
+    lg_h_scored = float(gf_h.sum()) / lg_gp_h if lg_gp_h else 1.30     # ~typical home GPG
+    lg_a_scored = float(gf_a.sum()) / lg_gp_a if lg_gp_a else 1.30     # ~typical away GPG
+    lg_all_scored = float(gf.sum()) / lg_gp_all if lg_gp_all else 2.60 # league GPG
 
     # Home advantage as a multiplicative factor on scoring rate
-    home_adv = _safe_ratio(lg_h_scored, lg_a_scored, default=1.05)
+    home_adv = lg_h_scored / lg_a_scored if lg_a_scored else 1.05
     if home_adv < 1.0:
         # Keep it ≥1.0 as the tests expect; clamp very small samples
         home_adv = 1.0
 
-    teams: Dict[str, Dict[str, float]] = {}
-
-    for _, row in base.iterrows():
-        team = row["team"]
-
-        # Per-team per-game rates (guard against zero games)
-        r_h_gpg_for = _safe_ratio(row["gf_h"], row["gp_h"], default=0.0)
-        r_h_gpg_against = _safe_ratio(row["ga_h"], row["gp_h"], default=0.0)
-        r_a_gpg_for = _safe_ratio(row["gf_a"], row["gp_a"], default=0.0)
-        r_a_gpg_against = _safe_ratio(row["ga_a"], row["gp_a"], default=0.0)
-        r_all_gpg_for = _safe_ratio(row["gf"], row["gp"], default=0.0)
-        r_all_gpg_against = _safe_ratio(row["ga"], row["gp"], default=0.0)
-
-        # Factors vs league baselines; fall back to 1.0 if denominator is unknown
-        att_h = _safe_ratio(r_h_gpg_for, lg_h_scored, default=1.0) or 1.0
-        def_h = _safe_ratio(r_h_gpg_against, lg_h_scored, default=1.0) or 1.0
-
-        att_a = _safe_ratio(r_a_gpg_for, lg_a_scored, default=1.0) or 1.0
-        def_a = _safe_ratio(r_a_gpg_against, lg_a_scored, default=1.0) or 1.0
-
-        att = _safe_ratio(r_all_gpg_for, lg_all_scored, default=1.0) or 1.0
-        dfn = _safe_ratio(r_all_gpg_against, lg_all_scored, default=1.0) or 1.0
-
-        teams[team] = {
-            "att": float(att),
-            "def": float(dfn),
-            "att_h": float(att_h),
-            "def_h": float(def_h),
-            "att_a": float(att_a),
-            "def_a": float(def_a),
-        }
+    # Factors vs league baselines, one array op per factor; the per-team dicts
+    # are zipped straight from the columns (no frame, no per-row Series).
+    cols = {
+        "att": _factor(gf, gp, lg_all_scored),
+        "def": _factor(ga, gp, lg_all_scored),
+        "att_h": _factor(gf_h, gp_h, lg_h_scored),
+        "def_h": _factor(ga_h, gp_h, lg_h_scored),
+        "att_a": _factor(gf_a, gp_a, lg_a_scored),
+        "def_a": _factor(ga_a, gp_a, lg_a_scored),
+    }
+    names = tuple(cols)
+    teams: Dict[str, Dict[str, float]] = {
+        t: dict(zip(names, vals))
+        for t, vals in zip(teams_u.tolist(), zip(*(c.tolist() for c in cols.values())))
+    }
 
     return {
         "teams": teams,
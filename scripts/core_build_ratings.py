@@ -1,10 +1,11 @@
 from __future__ import annotations
-import json, os
+import os
 from pathlib import Path
 import pandas as pd
 from plpred import log as logmod
 from plpred.ratings import build_ratings
 from plpred.elo import build_elo
+from plpred.files import write_json
 
 def main() -> None:
     logmod.setup()
@@ -20,11 +21,11 @@ def main() -> None:
         df = pd.DataFrame(columns=["utc_date","home","away","home_goals","away_goals"])
 
     ratings = build_ratings(df, half_life_days=half_life_days)
-    Path("data/team_strengths.json").write_text(json.dumps(ratings, indent=2))
+    write_json(Path("data/team_strengths.json"), ratings)
     print("[core_build_ratings] wrote data/team_strengths.json teams:", len(ratings.get("teams", {})))
 
     elo = build_elo(df, half_life_days=max(half_life_days, 120.0))
-    Path("data/elo_ratings.json").write_text(json.dumps(elo, indent=2))
+    write_json(Path("data/elo_ratings.json"), elo)
     print("[core_build_ratings] wrote data/elo_ratings.json teams:", len(elo.get("teams", {})))
 
 if __name__ == "__main__":
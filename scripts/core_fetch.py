@@ -4,22 +4,23 @@ from pathlib import Path
 import pandas as pd
 from plpred import log as logmod
 from plpred.fd_client import fetch_results
+from plpred.files import atomic_write
 
 def main() -> None:
     logmod.setup()
     logging.getLogger("urllib3").setLevel(logging.WARNING)
 
-    token = os.getenv("FOOTBALL_DATA_TOKEN")
     comp = os.getenv("FD_COMP", "PL")
     seasons = [int(s) for s in os.getenv("FD_SEASONS", "2024,2025").split(",")]
 
-    df = fetch_results(token, comp=comp, seasons=seasons)
+    # fetch_results reads FOOTBALL_DATA_TOKEN itself
+    df = fetch_results(league=comp, seasons=seasons)
     Path("data").mkdir(parents=True, exist_ok=True)
     if df.empty:
         print("[core_fetch] WARN: empty results; writing header only.")
         df = pd.DataFrame(columns=["utc_date","season","home","away","home_goals","away_goals"])
 
-    df.to_csv("data/fd_results.csv", index=False)
+    atomic_write("data/fd_results.csv", df.to_csv(index=False).encode("utf-8"))
     print("[core_fetch] wrote data/fd_results.csv rows:", len(df))
 
 if __name__ == "__main__":
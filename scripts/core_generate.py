@@ -1,17 +1,19 @@
 from __future__ import annotations
-import os, json
-from datetime import datetime, timedelta, timezone
+import os
+from datetime import datetime, timezone
 from pathlib import Path
+import numpy as np
 from plpred import log as logmod
-from plpred.fd_client import fetch_fixtures
-from plpred.predict import outcome_probs, top_scorelines
+from plpred.fd_client import fetch_fixtures_multi
+from plpred.files import read_json, write_json
+from plpred.predict import outcome_probs_batch, top_scorelines
 from plpred.elo import elo_match_probs
 
 def _load_json(path: str, default: dict) -> dict:
     p = Path(path)
     if p.exists():
         try:
-            return json.loads(p.read_text())
+            return read_json(p)
         except Exception:
             return default
     return default
@@ -42,29 +44,44 @@ def main() -> None:
     elo_init = float(elo.get("init", 1500.0))
 
     now = datetime.now(timezone.utc)
-    dfrom = now.date().isoformat()
-    dto   = (now + timedelta(days=window_days)).date().isoformat()
-    fixtures = fetch_fixtures(token, comp=comp, date_from=dfrom, date_to=dto, statuses=statuses)
+    # DataFrame with match_id/utc_date/home/away/competition columns for `comp`
+    fixtures = fetch_fixtures_multi([comp], days=window_days, token=token,
+                                    status=statuses)[comp]
 
-    preds = []
-    for m in fixtures:
-        h = (m.get("homeTeam") or {}).get("name", "?")
-        a = (m.get("awayTeam") or {}).get("name", "?")
-        k = m.get("utcDate")
+    # Resolve every team once into int ids, then gather per-fixture factors
+    # from flat arrays instead of chained dict lookups per fixture.
+    games = [(h or "?", a or "?", k) for h, a, k in zip(fixtures["home"].tolist(),
+                                                         fixtures["away"].tolist(),
+                                                         fixtures["utc_date"].tolist())]
+    team_id: dict = {}
+    for h, a, _ in games:
+        team_id.setdefault(h, len(team_id))
+        team_id.setdefault(a, len(team_id))
+    rows = [teams.get(t, {}) for t in team_id]
+    att_home = np.array([r.get("att_home", r.get("att", 1.0)) for r in rows], dtype=float)
+    def_home = np.array([r.get("def_home", r.get("def", 1.0)) for r in rows], dtype=float)
+    att_away = np.array([r.get("att_away", r.get("att", 1.0)) for r in rows], dtype=float)
+    def_away = np.array([r.get("def_away", r.get("def", 1.0)) for r in rows], dtype=float)
+    elo_r = np.array([float(elo_teams.get(t, {}).get("elo", elo_init)) for t in team_id])
 
-        ht = teams.get(h, {})
-        at = teams.get(a, {})
-        att_h = ht.get("att_home", ht.get("att", 1.0))
-        def_h = ht.get("def_home", ht.get("def", 1.0))
-        att_a = at.get("att_away", at.get("att", 1.0))
-        def_a = at.get("def_away", at.get("def", 1.0))
+    hi = np.array([team_id[h] for h, _, _ in games], dtype=np.int64)
+    ai = np.array([team_id[a] for _, a, _ in games], dtype=np.int64)
+    lams = np.maximum(0.05, base * att_home[hi] * def_away[ai] * home_adv).tolist()
+    mus = np.maximum(0.05, base * att_away[ai] * def_home[hi]).tolist()
+    elo_h = elo_r[hi].tolist()
+    elo_a = elo_r[ai].tolist()
+    # 1X2 Poisson probabilities for every fixture in one vectorised call
+    p_home, p_draw, p_away = (p.tolist() for p in
+                              outcome_probs_batch(lams, mus, draw_scale=draw_scale, cap=8))
 
-        lam = max(0.05, base * att_h * def_a * home_adv)
-        mu  = max(0.05, base * att_a * def_h)
-        pH_pois, pD_pois, pA_pois = outcome_probs(lam, mu, draw_scale=draw_scale, maxg=8)
+    preds = []
+    for n, (h, a, k) in enumerate(games):
+        lam = lams[n]
+        mu = mus[n]
+        pH_pois, pD_pois, pA_pois = p_home[n], p_draw[n], p_away[n]
 
-        Rh = float(elo_teams.get(h, {}).get("elo", elo_init))
-        Ra = float(elo_teams.get(a, {}).get("elo", elo_init))
+        Rh = elo_h[n]
+        Ra = elo_a[n]
         pH_elo, pD_elo, pA_elo = elo_match_probs(Rh, Ra, home_adv_points=elo_ha, scale=elo_scale, draw_nu=elo_nu)
 
         w = min(max(blend_elo, 0.0), 1.0)
@@ -90,8 +107,9 @@ def main() -> None:
             "notes": {"blend_elo": w}
         })
 
-    out = {"generated_utc": datetime.now(timezone.utc).isoformat(), "predictions": preds}
-    Path("data/predictions.json").write_text(json.dumps(out, indent=2))
+    out = {"generated_utc": now.isoformat(), "predictions": preds}
+    # Machine-read output: compact JSON, published atomically
+    write_json("data/predictions.json", out, compact=True)
     print("[core_generate] wrote data/predictions.json count:", len(preds))
 
 if __name__ == "__main__":
@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import os
-import json
 import datetime as _dt
 from pathlib import Path
 from typing import Dict, Any, List, Tuple
@@ -11,9 +10,11 @@ from collections import Counter
 import pandas as pd
 
 from plpred.fd_client import fetch_fixtures  # your client
+from plpred.files import read_json, write_json
 from plpred.predict import (
+    compile_ratings,
     expected_goals_for_pair,
-    outcome_probs,
+    outcome_probs_batch,
     top_scorelines,
 )
 
@@ -27,14 +28,10 @@ DEBUG_PATH = REPORTS_DIR / "fixtures_fetch_debug.json"
 
 def _read_json(p: Path) -> Any:
     if p.exists():
-        return json.loads(p.read_text(encoding="utf-8"))
+        return read_json(p)
     return None
 
 
-def _write_json(p: Path, obj: Any) -> None:
-    p.write_text(json.dumps(obj, indent=2), encoding="utf-8")
-
-
 def load_ratings() -> Dict[str, Any]:
     # try preferred first
     for candidate in [
@@ -65,18 +62,19 @@ def _is_fd_matches_payload(x: Any) -> bool:
 
 def _normalise_fd_matches_payload(x: Dict[str, Any]) -> pd.DataFrame:
     """Convert raw FD 'matches' payload to our columns."""
-    rows = []
-    for m in x.get("matches", []):
-        rows.append({
-            "match_id": m.get("id") or None,
-            "utc_date": m.get("utcDate"),
-            "home": (m.get("homeTeam") or {}).get("name"),
-            "away": (m.get("awayTeam") or {}).get("name"),
-            "competition": (m.get("competition") or {}).get("code") or (m.get("competition") or {}).get("name"),
-            "status": m.get("status"),
-        })
-    df = pd.DataFrame(rows)
-    return df
+    matches = x.get("matches", [])
+    if not matches:
+        return pd.DataFrame()
+    # Build each column directly rather than a dict per match
+    comps = [m.get("competition") or {} for m in matches]
+    return pd.DataFrame({
+        "match_id": [m.get("id") or None for m in matches],
+        "utc_date": [m.get("utcDate") for m in matches],
+        "home": [(m.get("homeTeam") or {}).get("name") for m in matches],
+        "away": [(m.get("awayTeam") or {}).get("name") for m in matches],
+        "competition": [c.get("code") or c.get("name") for c in comps],
+        "status": [m.get("status") for m in matches],
+    })
 
 
 def _ensure_df(obj: Any) -> pd.DataFrame:
@@ -124,8 +122,8 @@ def _finalise_fixtures_df(df: pd.DataFrame, label: str) -> pd.DataFrame:
     # Create match_id if not present
     if "match_id" not in df.columns or df["match_id"].isna().all():
         df["match_id"] = [
-            f"{r['utc_date']}_{(r['home'] or '')[:3]}-{(r['away'] or '')[:3]}"
-            for r in df.to_dict("records")
+            f"{k}_{(h or '')[:3]}-{(a or '')[:3]}"
+            for k, h, a in zip(df["utc_date"].tolist(), df["home"].tolist(), df["away"].tolist())
         ]
 
     # Ensure utc_date strings
@@ -195,14 +193,22 @@ def build_predictions(fixtures_df: pd.DataFrame, ratings: Dict[str, Any]) -> Dic
 
     draw_scale = float(ratings.get("draw_scale", 1.0))
 
-    for row in fixtures_df.to_dict("records"):
-        home = row["home"]
-        away = row["away"]
-        kickoff = row["utc_date"]
-        mid = row.get("match_id") or f"{kickoff}_{home[:3]}-{away[:3]}"
+    # Read the columns once instead of materialising a dict per row
+    homes = fixtures_df["home"].tolist()
+    aways = fixtures_df["away"].tolist()
+    kickoffs = fixtures_df["utc_date"].tolist()
+    mids = (fixtures_df["match_id"].tolist() if "match_id" in fixtures_df.columns
+            else [None] * len(homes))
+    compiled = compile_ratings(ratings)  # once per run, shared by every fixture
+    xg = [expected_goals_for_pair(h, a, ratings, compiled) for h, a in zip(homes, aways)]
+    # One vectorised pass for the 1X2 probabilities of every fixture
+    probs = outcome_probs_batch([x[0] for x in xg], [x[1] for x in xg], draw_scale=draw_scale)
+
+    for n, (home, away, kickoff, mid) in enumerate(zip(homes, aways, kickoffs, mids)):
+        mid = mid or f"{kickoff}_{home[:3]}-{away[:3]}"
 
-        lam_h, lam_a, dbg = expected_goals_for_pair(home, away, ratings)
-        ph, pd, pa = outcome_probs(lam_h, lam_a, draw_scale=draw_scale)
+        lam_h, lam_a, dbg = xg[n]
+        ph, pd, pa = (float(p[n]) for p in probs)
 
         preds.append({
             "match_id": mid,
@@ -227,7 +233,7 @@ def build_predictions(fixtures_df: pd.DataFrame, ratings: Dict[str, Any]) -> Dic
     }
 
     # quick diagnostics for mapping quality
-    _write_json(REPORTS_DIR / "name_resolution.json", {
+    write_json(REPORTS_DIR / "name_resolution.json", {
         "counts": {f"{k[0]}|{k[1]}": v for k, v in resolve_counts.items()},
         "examples": debug_rows[:100],
     })
@@ -243,21 +249,21 @@ def main() -> None:
     fixtures_df, dbg = fetch_fixtures_robust(days=window_days)
 
     # persist diagnostics
-    _write_json(DEBUG_PATH, dbg)
+    write_json(DEBUG_PATH, dbg)
 
     if fixtures_df.empty:
         print("[gen] No fixtures found after all strategies. Writing empty predictions.json")
-        _write_json(DATA_DIR / "predictions.json", {
+        write_json(DATA_DIR / "predictions.json", {
             "generated_utc": _dt.datetime.now(_dt.timezone.utc).isoformat(),
             "predictions": []
         })
         return
 
     # Always save what we used (helps debugging + offers future local fallback)
-    _write_json(DATA_DIR / "fixtures.json", fixtures_df.to_dict("records"))
+    write_json(DATA_DIR / "fixtures.json", fixtures_df.to_dict("records"))
 
     preds_obj = build_predictions(fixtures_df, ratings)
-    _write_json(DATA_DIR / "predictions.json", preds_obj)
+    write_json(DATA_DIR / "predictions.json", preds_obj)
 
     print(f"[gen] Fixtures used: {len(fixtures_df)}")
     print(f"[gen] Wrote: data/predictions.json, data/fixtures.json, "
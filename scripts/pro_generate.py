@@ -1,7 +1,6 @@
 from __future__ import annotations
-import json
-from pathlib import Path
 from datetime import datetime, timezone
+from plpred.files import write_json
 
 def main() -> None:
     out = {
@@ -9,7 +8,7 @@ def main() -> None:
         "predictions": [],
         "note": "Pro Mode placeholder: implement advanced model here.",
     }
-    Path("data/pro_predictions.json").write_text(json.dumps(out, indent=2))
+    write_json("data/pro_predictions.json", out)
     print("[pro_generate] wrote data/pro_predictions.json (placeholder)")
 
 if __name__ == "__main__":
@@ -0,0 +1,22 @@
+import json
+import pandas as pd
+import scripts.core_generate as core_generate
+
+def test_core_generate_smoke(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "team_strengths.json").write_text(json.dumps(
+        {"league_avg_gpg": 1.4, "home_adv": 1.1, "teams": {"A": {"att": 1.2, "def": 0.9}}}))
+    fixtures = pd.DataFrame({"match_id": [1], "utc_date": ["2099-01-01T15:00:00Z"],
+                             "home": ["A"], "away": ["B"], "competition": ["PL"]})
+    requested = []
+    def fake_fetch(leagues, days, token, status):
+        requested.append(status)
+        return {"PL": fixtures}
+    monkeypatch.delenv("FD_STATUSES", raising=False)
+    monkeypatch.setattr(core_generate, "fetch_fixtures_multi", fake_fetch)
+    core_generate.main()
+    assert requested == ["SCHEDULED,TIMED"]
+    preds = json.loads((tmp_path / "data" / "predictions.json").read_text())["predictions"]
+    assert [(p["home"], p["away"]) for p in preds] == [("A", "B")]
+    assert abs(sum(preds[0]["probs"].values()) - 1.0) < 1e-3
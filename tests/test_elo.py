@@ -1,3 +1,4 @@
+import pytest
 import pandas as pd
 from plpred.elo import build_elo, elo_match_probs
 
@@ -13,3 +14,51 @@ def test_elo_probs_sum_to_one():
     pH,pD,pA = elo_match_probs(1520, 1500, home_adv_points=60, scale=400, draw_nu=1.0)
     s = pH+pD+pA
     assert 0.99 < s < 1.01 and 0 < pH < 1 and 0 < pD < 1 and 0 < pA < 1
+
+_ROWS = [
+    {"utc_date":"2024-08-17T14:00:00Z","home":"C","away":"D","home_goals":3,"away_goals":0},
+    {"utc_date":"2024-08-10T12:00:00Z","home":"A","away":"B","home_goals":2,"away_goals":1},
+    {"utc_date":"2024-08-24T14:00:00Z","home":"B","away":"C","home_goals":1,"away_goals":1},
+    {"utc_date":"2024-08-31T14:00:00Z","home":"D","away":"A","home_goals":0,"away_goals":2},
+    {"utc_date":"2024-09-14T14:00:00Z","home":"A","away":"C","home_goals":1,"away_goals":4},
+]
+
+def _elos(e):
+    return {t: v["elo"] for t, v in e["teams"].items()}
+
+def test_build_elo_reference_values():
+    e = build_elo(pd.DataFrame(_ROWS), half_life_days=0)
+    # keys follow first appearance in play order, not input row order
+    assert list(e["teams"]) == ["A", "B", "C", "D"]
+    assert _elos(e) == pytest.approx({"A": 1504.1123063183009, "B": 1490.8644582903894,
+                                      "C": 1535.4906078530037, "D": 1469.532627538306}, abs=1e-9)
+    assert {t: v["games"] for t, v in e["teams"].items()} == {"A": 3, "B": 2, "C": 3, "D": 2}
+    assert e["draw_nu"] == pytest.approx(0.5)
+
+def test_build_elo_drops_rows_with_missing_goals():
+    rows = _ROWS + [{"utc_date":"2024-09-01T14:00:00Z","home":"B","away":"D","home_goals":None,"away_goals":1}]
+    e = build_elo(pd.DataFrame(rows), half_life_days=0)
+    assert _elos(e) == pytest.approx(_elos(build_elo(pd.DataFrame(_ROWS), half_life_days=0)), abs=1e-9)
+
+def test_build_elo_missing_team_name_is_its_own_team():
+    e = build_elo(pd.DataFrame([
+        {"utc_date":"2024-08-10T12:00:00Z","home":"A","away":"B","home_goals":2,"away_goals":1},
+        {"utc_date":"2024-08-17T12:00:00Z","home":"C","away":None,"home_goals":1,"away_goals":0},
+        {"utc_date":"2024-08-24T12:00:00Z","home":"B","away":"A","home_goals":0,"away_goals":1},
+    ]), half_life_days=0)
+    assert list(e["teams"]) == ["A", "B", "C", None]
+    assert e["teams"]["C"]["games"] == 1 and e["teams"][None]["games"] == 1
+    assert _elos(e) == pytest.approx({"A": 1519.1056568161541, "B": 1480.8943431838459,
+                                      "C": 1508.0699372293984, None: 1491.9300627706016}, abs=1e-9)
+
+def test_build_elo_naive_dates_are_utc():
+    naive = [dict(r, utc_date=r["utc_date"].replace("T", " ").rstrip("Z")) for r in _ROWS]
+    e = build_elo(pd.DataFrame(naive), half_life_days=0)
+    assert _elos(e) == pytest.approx(_elos(build_elo(pd.DataFrame(_ROWS), half_life_days=0)), abs=1e-9)
+
+def test_build_elo_unparseable_date_is_played_last():
+    rows = _ROWS + [{"utc_date":"not a date","home":"B","away":"D","home_goals":2,"away_goals":0}]
+    e = build_elo(pd.DataFrame(rows), half_life_days=0)
+    assert _elos(e) == pytest.approx({"A": 1504.112306318, "B": 1502.004026594,
+                                      "C": 1535.490607853, "D": 1458.393059235}, abs=1e-6)
+    assert e["draw_nu"] == pytest.approx(0.4)
@@ -1,5 +1,7 @@
 import pandas as pd
-from plpred.fd_client import fetch_results, fetch_fixtures
+import pytest
+import requests
+from plpred.fd_client import fetch_results, fetch_fixtures, fetch_fixtures_multi
 
 class DummyResp:
     def __init__(self, json_data, status=200): self._j, self.status_code = json_data, status
@@ -21,3 +23,78 @@ def test_fetch_fixtures_error_returns_empty():
     def bad_get(url, params, headers): return DummyResp({}, status=500)
     fx = fetch_fixtures(None, "PL", "2025-08-01", "2025-08-31", http_get=bad_get)
     assert fx == []
+
+def test_transport_errors_propagate():
+    def down(url, params, headers): raise requests.ConnectionError("no route")
+    with pytest.raises(requests.ConnectionError):
+        fetch_results(None, "PL", [2024], http_get=down)
+    with pytest.raises(requests.ConnectionError):
+        fetch_fixtures(None, "PL", "2025-08-01", "2025-08-31", http_get=down)
+
+def test_default_transport_is_memoised(monkeypatch):
+    import plpred.fd_client as fd
+    calls = []
+    def fake_http_get(url, headers=None, params=None, timeout=20):
+        calls.append(url)
+        return DummyResp({"matches": []})
+    monkeypatch.setattr(fd, "_http_get", fake_http_get)
+    fd._cached_get_json.cache_clear()
+    fd.fetch_results(None, "PL", [2024, 2024])
+    fd._cached_get_json.cache_clear()
+    assert len(calls) == 1
+
+def test_fetch_results_seasons_keyword_fetches_each_season():
+    seen = []
+    def fake_get(url, params, headers):
+        seen.append(params["season"])
+        return DummyResp({"matches":[
+            {"utcDate":"2024-08-10T12:00:00Z",
+             "homeTeam":{"name":"A"}, "awayTeam":{"name":"B"},
+             "score":{"fullTime":{"home":2,"away":1}}}
+        ]})
+    df = fetch_results(league="PL", seasons=[2024, 2025], http_get=fake_get)
+    assert sorted(seen) == [2024, 2025] and list(df["season"]) == [2024, 2025]
+
+def test_fetch_fixtures_multi_splits_by_competition():
+    def fake_get(url, params, headers):
+        assert params["competitions"] == "PL,CL" and params["status"] == "SCHEDULED,TIMED"
+        return DummyResp({"matches":[
+            {"id":1, "utcDate":"2025-08-10T12:00:00Z", "competition":{"code":"PL"},
+             "homeTeam":{"name":"A"}, "awayTeam":{"name":"B"}},
+            {"id":2, "utcDate":"2025-08-11T19:00:00Z", "competition":{"code":"CL"},
+             "homeTeam":{"name":"C"}, "awayTeam":{"name":"D"}},
+        ]})
+    out = fetch_fixtures_multi(["PL", "CL"], days=7, http_get=fake_get,
+                               status="SCHEDULED,TIMED")
+    assert list(out["PL"]["home"]) == ["A"] and list(out["CL"]["match_id"]) == [2]
+
+def test_cached_session_keeps_retry_adapter(monkeypatch, tmp_path):
+    import sys, types
+    import plpred.fd_client as fd
+    fake = types.ModuleType("requests_cache")
+    seen = {}
+    def fake_session(*a, **k):
+        seen.update(k)
+        return requests.Session()
+    fake.CachedSession = fake_session
+    monkeypatch.setitem(sys.modules, "requests_cache", fake)
+    fd._cached_session.cache_clear()
+    session = fd._cached_session(str(tmp_path))
+    fd._cached_session.cache_clear()
+    assert session.get_adapter("https://api.football-data.org").max_retries.total == 3
+    assert seen == {"backend": "sqlite", "cache_control": True,
+                    "expire_after": 3600, "stale_if_error": True}
+
+def test_http_get_uses_cached_session_only_when_opted_in(monkeypatch, tmp_path):
+    import plpred.fd_client as fd
+    calls = []
+    class FakeSession:
+        def get(self, url, **kw):
+            calls.append(url)
+    monkeypatch.setattr(fd, "_cached_session", lambda cache_dir: FakeSession())
+    monkeypatch.setattr(fd._SESSION, "get", lambda url, **kw: calls.append("plain"))
+    monkeypatch.delenv("PLPRED_HTTP_CACHE_DIR", raising=False)
+    fd._http_get("https://x")
+    monkeypatch.setenv("PLPRED_HTTP_CACHE_DIR", str(tmp_path))
+    fd._http_get("https://x")
+    assert calls == ["plain", "https://x"]
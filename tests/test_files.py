@@ -0,0 +1,26 @@
+import json
+from plpred.files import read_json, write_json
+
+def test_write_json_falls_back_for_non_str_keys(tmp_path):
+    p = tmp_path / "r.json"
+    write_json(p, {"teams": {float("nan"): {"att": 1.0}, "A": {"att": 1.2}}})
+    assert json.loads(p.read_text())["teams"]["A"] == {"att": 1.2}
+    assert [f.name for f in tmp_path.iterdir()] == ["r.json"]
+
+def test_read_json_accepts_nan_literals(tmp_path):
+    p = tmp_path / "n.json"
+    p.write_text('{"a": NaN, "b": [1, 2]}')
+    out = read_json(p)
+    assert out["b"] == [1, 2] and out["a"] != out["a"]
+
+def test_write_json_compact(tmp_path):
+    p = tmp_path / "c.json"
+    write_json(p, {"a": [1, 2]}, compact=True)
+    assert p.read_text() == '{"a":[1,2]}'
+
+def test_dumps_json_writes_non_finite_as_null_with_or_without_orjson(monkeypatch):
+    import plpred.files as files
+    obj = {"a": float("nan"), "b": [1.5, float("inf")], "c": (float("-inf"),)}
+    fast = files.dumps_json(obj, compact=True)
+    monkeypatch.setattr(files, "orjson", None)
+    assert files.dumps_json(obj, compact=True) == fast == b'{"a":null,"b":[1.5,null],"c":[null]}'
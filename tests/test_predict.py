@@ -1,4 +1,4 @@
-from plpred.predict import outcome_probs, top_scorelines
+from plpred.predict import outcome_probs, outcome_probs_batch, top_scorelines
 
 def test_outcome_probs_sane():
     ph,pd,pa = outcome_probs(1.3, 1.1, draw_scale=1.05)
@@ -9,3 +9,16 @@ def test_top_scorelines_len_and_keys():
     tops = top_scorelines(1.2, 0.9, k=3, cap=5)
     assert len(tops) == 3
     assert set(tops[0].keys()) == {"home_goals","away_goals","prob"}
+
+def test_outcome_probs_batch_matches_scalar():
+    ph, pd, pa = outcome_probs_batch([1.3, 0.4], [1.1, 2.6], draw_scale=1.05)
+    for i, (lh, la) in enumerate([(1.3, 1.1), (0.4, 2.6)]):
+        exp = outcome_probs(lh, la, draw_scale=1.05)
+        assert max(abs(a - b) for a, b in zip((ph[i], pd[i], pa[i]), exp)) < 1e-9
+
+def test_expected_goals_sees_in_place_rating_edits():
+    from plpred.predict import expected_goals_for_pair
+    ratings = {"teams": {"A": {"att_h": 1.0}, "B": {}}}
+    assert expected_goals_for_pair("A", "B", ratings)[:2] == (1.45, 1.35)
+    ratings["teams"]["A"]["att_h"] = 2.0
+    assert expected_goals_for_pair("A", "B", ratings)[0] == 2.9
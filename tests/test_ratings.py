@@ -1,3 +1,4 @@
+import pytest
 import pandas as pd
 from plpred.ratings import build_ratings
 
@@ -13,3 +14,25 @@ def test_build_ratings_empty_neutral():
     df = pd.DataFrame(columns=["utc_date","home","away","home_goals","away_goals"])
     r = build_ratings(df)
     assert r["teams"] == {} and r["league_avg_gpg"] > 0
+
+def test_build_ratings_nullable_goals_count_as_zero():
+    df = pd.DataFrame({"home": ["A", "B"], "away": ["B", "A"],
+                       "home_goals": pd.array([3, None], dtype="Int64"),
+                       "away_goals": pd.array([1, 1], dtype="Int64")})
+    r = build_ratings(df)
+    assert r["teams"]["A"]["att"] == 1.6 and r["teams"]["B"]["def_a"] == 3.0
+
+def test_build_ratings_reference_values():
+    df = pd.DataFrame([("C","D",3,0),("A","B",2,1),("B","C",1,1),("D","A",0,2),("A","C",1,4)],
+                      columns=["home","away","home_goals","away_goals"])
+    r = build_ratings(df)
+    assert list(r["teams"]) == ["A", "B", "C", "D"]
+    assert r["league_avg_gpg"] == pytest.approx(1.5) and r["home_adv"] == pytest.approx(1.0)
+    assert r["teams"]["A"] == pytest.approx({"att": 10/9, "def": 10/9, "att_h": 15/14,
+                                             "def_h": 25/14, "att_a": 1.25, "def_a": 1.0})
+    assert r["teams"]["C"] == pytest.approx({"att": 16/9, "def": 4/9, "att_h": 30/14,
+                                             "def_h": 1.0, "att_a": 1.5625, "def_a": 0.625})
+    # D never scored at home: a zero factor falls back to neutral
+    assert r["teams"]["D"] == pytest.approx({"att": 1.0, "def": 5/3, "att_h": 1.0,
+                                             "def_h": 20/14, "att_a": 1.0, "def_a": 1.875})
+    assert r["teams"]["B"]["def_a"] == pytest.approx(1.25)